@@ -0,0 +1,88 @@
+"""
+
+Caches the connections of the nodes of the current nuke script so the nodes upstream or downstream of a node
+can be listed without calling node.dependencies() or node.dependent() for every node of the closure.
+Used by the Upstream and Downstream buttons of the Node Lister.
+
+"""
+
+__author__ = 'John'
+
+import nuke
+
+
+class DependencyGraph(object):
+    """
+    The connections are read with node.dependencies(), which includes the hidden inputs and expression links,
+    by the first walk after invalidate().  NodeLister invalidates it when nodes are created, deleted or renamed,
+    when a node sends inputChange and on Refresh.  NUKE only sends inputChange for the nodes with an open
+    control panel, the other connection changes are picked up by Refresh.
+    """
+
+    def __init__(self):
+        super(DependencyGraph, self).__init__()
+
+        self._upstream = None
+        """:type: dict[str, set[str]]"""           # {node name: names of the nodes it depends on}
+        self._downstream = None
+        """:type: dict[str, set[str]]"""           # {node name: names of the nodes depending on it}
+
+    def downstream(self, names):
+        """
+
+        :param names:
+        :type names: list[str]
+        :return: the names and the names of all nodes downstream of them
+        :rtype: set[str]
+        """
+        self._build()
+        return self._closure(names, self._downstream)
+
+    def invalidate(self):
+        self._upstream = None
+        self._downstream = None
+
+    def upstream(self, names):
+        """
+
+        :param names:
+        :type names: list[str]
+        :return: the names and the names of all nodes upstream of them
+        :rtype: set[str]
+        """
+        self._build()
+        return self._closure(names, self._upstream)
+
+    def _build(self):
+        if self._upstream is not None:
+            return
+
+        self._upstream = {}
+        self._downstream = {}
+        for node in nuke.allNodes():
+            name = node.name()
+            input_names = set(input_node.name() for input_node in node.dependencies())
+            self._upstream[name] = input_names
+            self._downstream.setdefault(name, set())
+            for input_name in input_names:
+                self._downstream.setdefault(input_name, set()).add(name)
+
+    @staticmethod
+    def _closure(names, edges):
+        """
+
+        :param names:
+        :type names: list[str]
+        :param edges:
+        :type edges: dict[str, set[str]]
+        :return:
+        :rtype: set[str]
+        """
+        closure = set(names)
+        stack = list(names)
+        while stack:
+            for other in edges.get(stack.pop(), ()):
+                if other not in closure:
+                    closure.add(other)
+                    stack.append(other)
+        return closure
@@ -0,0 +1,184 @@
+"""
+
+This tool imports nodeIndexDB, nodeLister and nukeScript from its directory, so the NodeLister directory
+has to be on sys.path, for example with nuke.pluginAddPath() in init.py.  It is launched from the Script Editor
+in NUKE with:
+
+    import nodeIndex
+    nodeIndex.main()
+
+This nuke tool keeps an inventory of the nodes found in every nuke script of a directory tree.
+The inventory is stored in a local SQLite database so it does not need to be rebuilt each time.
+Pressing Update only re-scans the scripts whose modification time or size changed since the last update.
+Scripts that were removed from the directory tree are removed from the inventory.
+
+The scripts are read as text, they are not opened in NUKE.  For every node the class, name, disable state
+and group path is stored.
+
+The results of a query are shown in the same tree as the Node Lister, organized by node class.
+There is a class field which only lists the nodes of that class.  It is case-sensative.
+There is a name search field which only lists the nodes that match the search.  It is not case-sensative.
+The NodeRows are named after the script they were found in and the full name of the node.
+Clicking on the Name column in the NodeRow will open the script.
+
+"""
+
+__author__ = 'John'
+
+import nuke
+import os
+import time
+from PySide.QtCore import Qt
+from PySide.QtGui import QFrame, QHBoxLayout, QLabel, QLineEdit, QMouseEvent, QPushButton, QVBoxLayout
+
+from nodeIndexDB import NodeIndex
+from nodeLister import NodeDelegate, NodeRow, NodeTree
+
+
+class NodeIndexLister(QFrame):
+    DB_PATH = os.path.join(os.path.expanduser('~'), '.nuke', 'nodeIndex.db')
+
+    def __init__(self, db_path=None):
+        """
+
+        :param db_path: path to the SQLite database, defaults to DB_PATH
+        :type db_path: str
+        """
+        super(NodeIndexLister, self).__init__()
+
+        self.setWindowTitle('Node Index')
+
+        self._index = NodeIndex(db_path or self.DB_PATH)
+
+        self._ledit_root = QLineEdit()
+        self._btn_update = QPushButton('Update')
+        self._tree = IndexTree()
+        self._ledit_class = QLineEdit()
+        self._ledit_search = QLineEdit()
+        self._btn_query = QPushButton('Query')
+        self._lbl_status = QLabel()
+
+        self._setup_ui()
+        self._set_connections()
+
+    def _query(self):
+        model = self._tree.model().sourceModel()
+
+        start = time.time()
+        nodes = self._index.find(node_class=str(self._ledit_class.text()).strip() or None,
+                                 name=str(self._ledit_search.text()).strip() or None,
+                                 limit=NodeIndex.MAX_RESULTS + 1)
+        elapsed = time.time() - start
+
+        truncated = len(nodes) > NodeIndex.MAX_RESULTS
+        nodes = nodes[:NodeIndex.MAX_RESULTS]
+
+        node_dict = {}
+
+        for node in nodes:
+            if node.Class() not in node_dict.keys():
+                node_dict[node.Class()] = []
+            node_dict[node.Class()].append(node)
+
+        model.clear_rows()
+
+        if node_dict:
+            model.populate(node_dict)
+
+        msg = '%d nodes in %d scripts (%.1f ms)' % (len(nodes), len(set(n.script() for n in nodes)), elapsed * 1000)
+        if truncated:
+            msg += ', only the first %d are shown' % NodeIndex.MAX_RESULTS
+        self._lbl_status.setText(msg)
+
+    def _set_connections(self):
+        self._btn_update.released.connect(self._update)
+        self._btn_query.released.connect(self._query)
+        self._ledit_class.returnPressed.connect(self._query)
+        self._ledit_search.returnPressed.connect(self._query)
+
+    def _setup_ui(self):
+        self._btn_update.setToolTip('Re-scan the scripts in the directory that changed since the last update')
+        self._btn_query.setToolTip('List the indexed nodes matching the class and name search')
+        self._ledit_root.setToolTip('Directory of nuke scripts')
+        self._ledit_class.setToolTip('Node class, leave empty for all classes')
+        self._ledit_search.setToolTip('Search by node name')
+
+        lyt_root = QHBoxLayout()
+        lyt_root.addWidget(QLabel('Directory'))
+        lyt_root.addWidget(self._ledit_root)
+        lyt_root.addWidget(self._btn_update)
+
+        lyt_search = QHBoxLayout()
+        lyt_search.addWidget(QLabel('Class'))
+        lyt_search.addWidget(self._ledit_class)
+        lyt_search.addWidget(QLabel('Name Search'))
+        lyt_search.addWidget(self._ledit_search)
+        lyt_search.addWidget(self._btn_query)
+
+        lyt_main = QVBoxLayout()
+        lyt_main.addLayout(lyt_root)
+        lyt_main.addWidget(self._tree)
+        lyt_main.addLayout(lyt_search)
+        lyt_main.addWidget(self._lbl_status)
+
+        self.setLayout(lyt_main)
+
+    def _update(self):
+        root = str(self._ledit_root.text()).strip()
+
+        if not os.path.isdir(root):
+            msg = 'Please pick a proper directory.'
+            print(msg)
+            nuke.message(msg)
+            return
+
+        start = time.time()
+        scanned, removed = self._index.update(root)
+        elapsed = time.time() - start
+
+        self._lbl_status.setText('%d scripts scanned, %d removed (%.1f s)' % (scanned, removed, elapsed))
+
+
+class IndexTree(NodeTree):
+    def __init__(self):
+        super(IndexTree, self).__init__()
+
+        self.setItemDelegate(IndexDelegate())
+
+
+class IndexDelegate(NodeDelegate):
+    def editorEvent(self, event, model, option, index):
+        """
+        The indexed nodes are not in the current script so they can not be zoomed to or disabled.
+
+        :param event:
+        :type event: QEvent
+        :param model:
+        :type model: QSortFilterProxyModel
+        :param option:
+        :type option: QStyleOptionViewItem
+        :param index:
+        :type index: QModelIndex
+        :return:
+        :rtype: bool
+        """
+        idx = index.model().mapToSource(index)
+        item = model.sourceModel().itemFromIndex(idx)
+        row = item.get_parent_row()
+
+        if event.type() != QMouseEvent.MouseButtonRelease:
+            return False
+
+        if type(row) == NodeRow and event.button() == Qt.MouseButton.LeftButton:
+            if item.get_header() == 'Node':
+                nuke.scriptOpen(row.get_node().script())
+
+        return True
+
+
+def main():
+    nuke.ui = NodeIndexLister()
+    nuke.ui.show()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+"""
+
+The SQLite inventory of the nodes of the nuke scripts of a directory tree, used by the Node Index.
+It does not import NUKE or Qt so it can be used and tested outside of NUKE.
+
+"""
+
+__author__ = 'John'
+
+import os
+import sqlite3
+
+from nukeScript import parse_script
+
+
+class NodeIndex(object):
+    MAX_RESULTS = 20000                                     # keeps the tree responsive for broad queries
+    VERSION = 1                                             # raise it when SCHEMA or parse_script change
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scripts (
+            path TEXT PRIMARY KEY,
+            mtime REAL NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS nodes (
+            script TEXT NOT NULL REFERENCES scripts(path),
+            node_class TEXT NOT NULL,
+            name TEXT NOT NULL,
+            disabled INTEGER,
+            group_path TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS nodes_script ON nodes(script);
+        CREATE INDEX IF NOT EXISTS nodes_class ON nodes(node_class);
+        CREATE INDEX IF NOT EXISTS nodes_name ON nodes(name COLLATE NOCASE);
+    """
+    DROP = """
+        DROP TABLE IF EXISTS nodes;
+        DROP TABLE IF EXISTS scripts;
+    """
+
+    def __init__(self, db_path):
+        """
+
+        :param db_path: path to the SQLite database, it is created if it does not exist
+                        and rebuilt if it was made by another VERSION
+        :type db_path: str
+        """
+        super(NodeIndex, self).__init__()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.isdir(db_dir):
+            os.makedirs(db_dir)
+
+        self._conn = sqlite3.connect(db_path)
+        if self._conn.execute('PRAGMA user_version').fetchone()[0] != self.VERSION:
+            self._conn.executescript(self.DROP)             # the scripts are parsed again by the next update
+            self._conn.execute('PRAGMA user_version = %d' % self.VERSION)
+        self._conn.executescript(self.SCHEMA)
+
+    def classes(self):
+        """
+
+        :return: [(node class, node count, script count),...] sorted by node class
+        :rtype: list[tuple]
+        """
+        return self._conn.execute(
+            'SELECT node_class, COUNT(*), COUNT(DISTINCT script) FROM nodes GROUP BY node_class ORDER BY node_class'
+        ).fetchall()
+
+    def close(self):
+        self._conn.close()
+
+    def find(self, node_class=None, name=None, disabled=None, script=None, limit=None):
+        """
+
+        :param node_class: exact node class
+        :type node_class: str
+        :param name: part of the node name, not case-sensative
+        :type name: str
+        :param disabled: only the disabled nodes if True, only the enabled nodes if False,
+                         nodes disabled by an expression are in neither
+        :type disabled: bool
+        :param script: part of the script path
+        :type script: str
+        :param limit: maximum number of nodes returned
+        :type limit: int
+        :return:
+        :rtype: list[IndexedNode]
+        """
+        where = []
+        args = []
+        if node_class is not None:
+            where.append('node_class = ?')
+            args.append(node_class)
+        if name is not None:
+            where.append("name LIKE ? ESCAPE '\\'")
+            args.append('%' + self._escape_like(name) + '%')
+        if disabled is not None:
+            where.append('disabled = ?')
+            args.append(int(bool(disabled)))
+        if script is not None:
+            where.append("script LIKE ? ESCAPE '\\'")
+            args.append('%' + self._escape_like(script) + '%')
+
+        sql = 'SELECT script, node_class, name, disabled, group_path FROM nodes'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        if limit is not None:
+            sql += ' LIMIT %d' % limit
+
+        return [IndexedNode(*record) for record in self._conn.execute(sql, args)]
+
+    def scripts_using(self, node_class):
+        """
+
+        :param node_class:
+        :type node_class: str
+        :return: sorted paths of the scripts that contain a node of that class
+        :rtype: list[str]
+        """
+        records = self._conn.execute(
+            'SELECT DISTINCT script FROM nodes WHERE node_class = ? ORDER BY script', (node_class,)
+        )
+        return [record[0] for record in records]
+
+    def update(self, root):
+        """
+        Re-scans the scripts under root whose modification time or size changed
+        and forgets the scripts that no longer exist.
+
+        :param root: directory of nuke scripts
+        :type root: str
+        :return: (number of scripts scanned, number of scripts removed)
+        :rtype: tuple
+        """
+        root = os.path.abspath(root)
+
+        prefix = os.path.join(root, '')
+        known = dict(
+            (path, (mtime, size)) for path, mtime, size in self._conn.execute(
+                'SELECT path, mtime, size FROM scripts WHERE substr(path, 1, ?) = ?', (len(prefix), prefix)
+            )
+        )
+
+        found = set()
+        scanned = 0
+
+        with self._conn:
+            for dir_path, dir_names, file_names in os.walk(root):
+                for file_name in file_names:
+                    if not file_name.endswith('.nk'):
+                        continue
+
+                    path = os.path.join(dir_path, file_name)
+                    try:
+                        stat = os.stat(path)
+                        found.add(path)
+                        if known.get(path) == (stat.st_mtime, stat.st_size):
+                            continue
+                        nodes = parse_script(path)
+                    except (IOError, OSError):
+                        continue                                # unreadable, it will be retried next update
+
+                    self._forget(path)
+                    self._conn.execute('INSERT INTO scripts VALUES (?, ?, ?)', (path, stat.st_mtime, stat.st_size))
+                    self._conn.executemany(
+                        'INSERT INTO nodes VALUES (?, ?, ?, ?, ?)',
+                        [(path, node_class, name, disabled, group_path)
+                         for node_class, name, disabled, group_path in nodes]
+                    )
+                    scanned += 1
+
+            removed = [path for path in known if path not in found]
+            for path in removed:
+                self._forget(path)
+
+        return scanned, len(removed)
+
+    @staticmethod
+    def _escape_like(text):
+        return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+    def _forget(self, path):
+        self._conn.execute('DELETE FROM nodes WHERE script = ?', (path,))
+        self._conn.execute('DELETE FROM scripts WHERE path = ?', (path,))
+
+
+class IndexedNode(object):
+    """
+    Stands in for a nuke.Node of a script that is not open so it can be listed in a NodeTree.
+    """
+
+    def __init__(self, script, node_class, name, disabled, group_path):
+        """
+
+        :param script: path of the script the node was found in
+        :type script: str
+        :param node_class:
+        :type node_class: str
+        :param name:
+        :type name: str
+        :param disabled: None if the disable knob is driven by an expression
+        :type disabled: int|None
+        :param group_path: full name of the group the node is in, empty for the root
+        :type group_path: str
+        """
+        super(IndexedNode, self).__init__()
+
+        self._script = script
+        self._node_class = node_class
+        self._name = name
+        self._group_path = group_path
+        self._knobs = {'disable': IndexedKnob(None if disabled is None else bool(disabled))}
+
+    def Class(self):
+        return self._node_class
+
+    def full_name(self):
+        if self._group_path:
+            return '%s.%s' % (self._group_path, self._name)
+        return self._name
+
+    def group_path(self):
+        return self._group_path
+
+    def knob(self, name):
+        return self._knobs[name]
+
+    def knobs(self):
+        return self._knobs
+
+    def name(self):
+        """
+
+        :return: the script file name and the full name of the node
+        :rtype: str
+        """
+        return '%s | %s' % (os.path.basename(self._script), self.full_name())
+
+    def script(self):
+        return self._script
+
+
+class IndexedKnob(object):
+    def __init__(self, value):
+        super(IndexedKnob, self).__init__()
+
+        self._value = value
+
+    def value(self):
+        return self._value
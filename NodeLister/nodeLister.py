@@ -1,44 +1,182 @@
 """
 
-This tool can be launched by copying the code and pasting in the Script Editor in NUKE.
+This tool imports dependencyGraph from its directory, so the NodeLister directory has to be on sys.path,
+for example with nuke.pluginAddPath() in init.py.  It is launched from the Script Editor in NUKE with:
+
+    import nodeLister
+    nodeLister.main()
 
 This nuke tool lists all nodes found in the current nuke script.  It organizes them by node class.
 There is a name search field which hides all nodes that do not match the node name search.  It is not case-sensative.
 There is a button to toggle the expansion and collapse of the rows of the node classes.
 
-In the tree itself, there are only two columns: Name and Disable.
+In the tree itself, there are two columns: Name and Disable, followed by the extra columns.
+The extra columns show knob values such as the Read file path or frame range.  Their values are only fetched
+for the rows that are shown, a few at a time so scrolling is not blocked, and are kept until the knobs change.
+Values that depend on the upstream nodes, like the frame range, are fetched again when any knob changes.
+Sorting by an extra column fetches the values of all rows first.  Right clicking the header hides extra columns.
 There are two types of rows: ClassRows and NodeRows (sub rows)
 Clicking on the Name column in the NodeRow will center zoom the node in the DAG.
 Clicking on the Disable column in the NodeRow will disable the node in the script.
 Clicking on the Disable column in the ClassRow will disable all nodes of that class.
 
+Pressing Profile renders a frame range of the selected Write nodes, or all enabled Write nodes, with the
+performance timers on.  The cost of each node is shown in the profile columns, which are added by the first
+profile, and the ClassRows show the total of their nodes, including the nodes inside Groups.
+Sorting by Wall (ms) lists the most expensive nodes first.
+Export Profile saves it as JSON.
+
+The Upstream and Downstream buttons only list the nodes upstream or downstream of the nodes selected in the DAG.
+The connections of the script are cached until nodes are created, deleted or renamed, or Refresh is pressed.
+Pressing the button again lists all the nodes.
+
+Selecting nodes in the DAG selects and scrolls to their NodeRows, and selecting NodeRows selects their nodes
+in the DAG.  NUKE does not send knobChanged for the selection of nodes with a closed control panel, so the DAG
+selection is checked on a timer while the window is visible.
+
 """
 
 __author__ = 'John'
 
+import json
 import nuke
 import re
-from PySide.QtCore import QObject, Qt
-from PySide.QtGui import QBrush, QColor, QFrame, QHBoxLayout, QIcon, QLabel, QLineEdit, QMouseEvent, QPushButton, \
+import time
+from collections import OrderedDict
+from PySide.QtCore import QObject, QSize, Qt, QTimer
+from PySide.QtGui import QAbstractItemView, QAction, QBrush, QColor, QFrame, QHBoxLayout, QHeaderView, QIcon, \
+    QItemSelection, QItemSelectionModel, QLabel, QLineEdit, QMenu, QMouseEvent, QProgressDialog, QPushButton, \
     QSortFilterProxyModel, QStandardItem, QStandardItemModel, QStyledItemDelegate, QTreeView, QVBoxLayout
 
+from dependencyGraph import DependencyGraph
+
 
 class NodeLister(QFrame):
-    def __init__(self):
+    UI_KNOBS = ('xpos', 'ypos', 'selected', 'showPanel', 'hidePanel')        # knobs that do not change column values
+    DAG_SELECTION_INTERVAL = 300                                # milliseconds between checks of the DAG selection
+
+    def __init__(self, extra_columns=None):
+        """
+
+        :param extra_columns: columns shown after Node and Disable, defaults to EXTRA_COLUMNS
+        :type extra_columns: list[ExtraColumn]
+        """
         super(NodeLister, self).__init__()
 
         self.setWindowTitle('Node Lister')
 
+        if extra_columns is None:
+            extra_columns = EXTRA_COLUMNS
+
         self._btn_refresh = QPushButton('Refresh')
         self._btn_expand = QPushButton('Expand/Collapse')
-        self._tree = NodeTree()
+        self._btn_profile = QPushButton('Profile')
+        self._btn_export = QPushButton('Export Profile')
+        self._btn_upstream = QPushButton('Upstream')
+        self._btn_downstream = QPushButton('Downstream')
+        self._graph = DependencyGraph()
+        self._graph_names = None                                # names of the nodes listed by the graph filter
+        self._profile = PerformanceProfile()
+        self._tree = NodeTree(extra_columns)
         self._ledit_search = QLineEdit()
 
         self._expand_state = False
 
+        self._syncing_selection = False                         # ignores the selection changes made by the sync
+        self._dag_selection = None                              # names of the nodes last selected in the DAG
+        self._dag_selection_timer = QTimer(self)               # DAG to tree, polled while the window is visible
+        self._dag_selection_timer.setInterval(self.DAG_SELECTION_INTERVAL)
+        self._tree_selection_timer = QTimer(self)              # tree to DAG
+        self._tree_selection_timer.setSingleShot(True)
+        self._tree_selection_timer.setInterval(0)
+
+        self._callbacks_added = False                           # the callbacks are only added while shown
+
         self._setup_ui()
         self._set_connections()
 
+    def closeEvent(self, event):
+        """
+
+        :param event:
+        :type event: QCloseEvent
+        """
+        self._remove_callbacks()
+        super(NodeLister, self).closeEvent(event)
+
+    def hideEvent(self, event):
+        """
+
+        :param event:
+        :type event: QHideEvent
+        """
+        self._dag_selection_timer.stop()
+        self._remove_callbacks()
+        super(NodeLister, self).hideEvent(event)
+
+    def showEvent(self, event):
+        """
+        The changes made while hidden are not known, so the values of the extra columns
+        and the connections are fetched again.
+
+        :param event:
+        :type event: QShowEvent
+        """
+        super(NodeLister, self).showEvent(event)
+        if not self._callbacks_added:
+            nuke.addKnobChanged(self._knob_changed)
+            nuke.addOnCreate(self._graph.invalidate)
+            nuke.addOnDestroy(self._graph.invalidate)
+            self._callbacks_added = True
+            model = self._tree.model().sourceModel()
+            model.invalidate_columns(model.get_extra_headers())
+            self._graph.invalidate()
+
+        self._dag_selection = None
+        self.sync_dag_selection()
+        self._dag_selection_timer.start()
+
+    def sync_dag_selection(self):
+        """
+        Selects the NodeRows of the nodes selected in the DAG if the DAG selection changed since the last check.
+        """
+        if self._syncing_selection:
+            return
+
+        nodes = nuke.selectedNodes()
+        names = frozenset(node.name() for node in nodes)
+        if names == self._dag_selection:
+            return
+        self._dag_selection = names
+
+        proxy = self._tree.model()
+        model = proxy.sourceModel()
+        if any(model.get_node_row(name) is None for name in names):
+            model.update_names()                                # renamed without a knobChanged
+
+        selection = QItemSelection()
+        parents = {}
+        first_index = None
+        for node in nodes:
+            row = model.get_node_row(node.name())
+            if row is None:
+                continue
+            index = proxy.mapFromSource(model.indexFromItem(row.get_item('Node')))
+            selection.select(index, index)
+            parents[index.parent().row()] = index.parent()
+            if first_index is None:
+                first_index = index
+
+        self._syncing_selection = True
+        try:
+            self._tree.selectionModel().select(selection, QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows)
+        finally:
+            self._syncing_selection = False
+        self._tree.expand_indexes(parents.values())             # after selecting, the collapsed rows are not laid out
+
+        if first_index is not None:
+            self._tree.scrollTo(first_index)
+
     def _expand_toggle(self):
         self._expand_state = not self._expand_state
         if self._expand_state:
@@ -47,13 +185,13 @@ class NodeLister(QFrame):
             self._tree.collapseAll()
 
     def _filter_list(self):
-        search_strings = str(self._ledit_search.text()).split()
+        search_strings = [search_item.strip().lower() for search_item in str(self._ledit_search.text()).split()]
         proxy = self._tree.model()
         model = proxy.sourceModel()
-        show_rows = list()
+        show_rows = set()
         node_rows = list()
         rows = model.get_rows()
-        class_rows = filter(lambda x: type(x) == ClassRow, rows)
+        class_rows = [row for row in rows if type(row) == ClassRow]
         for class_row in class_rows:
             node_rows.extend(class_row.get_node_rows())
 
@@ -63,16 +201,18 @@ class NodeLister(QFrame):
             proxy_index = proxy.mapFromSource(index)
             self._tree.setRowHidden(proxy_index.row(), proxy_index.parent(), False)
 
-        if search_strings:
-            for search_item in search_strings:
-                for row in node_rows:
-                    if search_item.strip().lower() in row.get_item('Node').text().lower():
-                        show_rows.append(row)
+        if search_strings or self._graph_names is not None:
+            for row in node_rows:
+                name = row.get_item('Node').text()
+                if self._graph_names is not None and name not in self._graph_names:
+                    continue
+                if not search_strings or any(search_item in name.lower() for search_item in search_strings):
+                    show_rows.add(row)
 
             self._tree.expandAll()
             self._expand_state = True
 
-            show_class_rows = list(set(map(lambda x: x.get_parent_class_row(), show_rows)))
+            show_class_rows = set(map(lambda x: x.get_parent_class_row(), show_rows))
 
             for row in node_rows:
                 if row not in show_rows:
@@ -90,7 +230,90 @@ class NodeLister(QFrame):
             self._tree.collapseAll()
             self._expand_state = False
 
+    def _export_profile(self):
+        if not self._profile.has_results():
+            nuke.message('Please profile first.')
+            return
+
+        path = nuke.getFilename('Export Profile', '*.json', type='save')
+        if path:
+            self._profile.to_json(path)
+
+    def _graph_filter(self, button):
+        """
+        Lists the nodes upstream or downstream of the nodes selected in the DAG, or all nodes if already listed.
+
+        :param button: the Upstream or Downstream button
+        :type button: QPushButton
+        """
+        other = self._btn_downstream if button == self._btn_upstream else self._btn_upstream
+        other.setChecked(False)
+
+        if not button.isChecked():
+            self._graph_names = None
+        else:
+            names = [node.name() for node in nuke.selectedNodes()]
+            if not names:
+                button.setChecked(False)
+                nuke.message('Please select a node in the DAG.')
+                return
+
+            if button == self._btn_upstream:
+                self._graph_names = self._graph.upstream(names)
+            else:
+                self._graph_names = self._graph.downstream(names)
+
+        self._filter_list()
+
+    def _knob_changed(self):
+        knob_name = nuke.thisKnob().name()
+        if knob_name in self.UI_KNOBS:
+            return
+
+        full_name = nuke.thisNode().fullName()
+        model = self._tree.model().sourceModel()
+        if knob_name in ('inputChange', 'name') and '.' not in full_name:
+            self._graph.invalidate()
+            if knob_name == 'name':
+                model.update_names()
+
+        root_name = full_name.split('.')[0]                      # a node inside a Group changes the Group
+        if model.invalidate(root_name):
+            self._tree.viewport().update()
+
+    def _profile_render(self):
+        writes = nuke.selectedNodes('Write')
+        if not writes:
+            writes = [node for node in nuke.allNodes('Write') if not node.knob('disable').value()]
+        if not writes:
+            nuke.message('There are no Write nodes to render.')
+            return
+
+        root = nuke.root()
+        frames = nuke.getInput('Frames to profile', '%d' % root.firstFrame())
+        if not frames:
+            return
+
+        try:
+            frame_range = nuke.FrameRange(frames)
+        except (RuntimeError, ValueError):
+            nuke.message('Please enter a proper frame range.')
+            return
+
+        self._profile.run(writes, frame_range)
+
+        model = self._tree.model().sourceModel()
+        if PerformanceProfile.SORT_HEADER in model.HEADER:
+            model.invalidate_columns(self._profile.headers())
+        else:
+            self._tree.add_extra_columns(self._profile.columns())               # added by the first profile
+        for header in self._profile.headers():
+            self._tree.setColumnHidden(model.HEADER.index(header), False)
+        self._tree.sort_by_extra_column(model.HEADER.index(PerformanceProfile.SORT_HEADER), Qt.DescendingOrder)
+
     def _refresh(self):
+        self._graph.invalidate()
+
         model = self._tree.model().sourceModel()
         nodes = nuke.allNodes()
 
@@ -105,25 +328,80 @@ class NodeLister(QFrame):
 
         model.populate(node_dict)
 
+        if self._graph_names is not None or self._ledit_search.text():
+            self._filter_list()                                 # the new rows are all shown
+
+    def _remove_callbacks(self):
+        if self._callbacks_added:
+            nuke.removeKnobChanged(self._knob_changed)
+            nuke.removeOnCreate(self._graph.invalidate)
+            nuke.removeOnDestroy(self._graph.invalidate)
+            self._callbacks_added = False
+
+    def _select_tree_nodes(self):
+        if self._syncing_selection:
+            return
+
+        proxy = self._tree.model()
+        model = proxy.sourceModel()
+
+        nodes = {}
+        for index in self._tree.selectionModel().selectedRows():
+            row = model.itemFromIndex(proxy.mapToSource(index)).get_parent_row()
+            if type(row) == NodeRow:
+                nodes[row.get_item('Node').text()] = row.get_node()
+
+        self._syncing_selection = True
+        try:
+            for node in nuke.selectedNodes():
+                if node.name() not in nodes:
+                    node.setSelected(False)
+            for node in nodes.values():
+                node.setSelected(True)
+        finally:
+            self._syncing_selection = False
+        self._dag_selection = frozenset(nodes)                   # not synced back to the tree
+
     def _set_connections(self):
         self._btn_refresh.released.connect(self._refresh)
         self._ledit_search.textChanged.connect(self._filter_list)
         self._btn_expand.released.connect(self._expand_toggle)
+        self._btn_profile.released.connect(self._profile_render)
+        self._btn_export.released.connect(self._export_profile)
+        self._btn_upstream.clicked.connect(lambda: self._graph_filter(self._btn_upstream))
+        self._btn_downstream.clicked.connect(lambda: self._graph_filter(self._btn_downstream))
+        self._tree.selectionModel().selectionChanged.connect(self._tree_selection_changed)
+        self._dag_selection_timer.timeout.connect(self.sync_dag_selection)
+        self._tree_selection_timer.timeout.connect(self._select_tree_nodes)
+
+    def _tree_selection_changed(self):
+        if not self._syncing_selection:
+            self._tree_selection_timer.start()
 
     def _setup_ui(self):
         self._btn_refresh.setIcon(QIcon(':qrc/images/Refresh.png'))
         self._btn_refresh.setToolTip('Populate tree with nodes')
         self._btn_expand.setToolTip('Toggle expanding and collapsing the tree')
+        self._btn_profile.setToolTip('Render the Write nodes with performance timers to find the expensive nodes')
+        self._btn_export.setToolTip('Save the profile as JSON')
+        self._btn_upstream.setToolTip('Only list the nodes upstream of the nodes selected in the DAG')
+        self._btn_downstream.setToolTip('Only list the nodes downstream of the nodes selected in the DAG')
+        self._btn_upstream.setCheckable(True)
+        self._btn_downstream.setCheckable(True)
         self._ledit_search.setToolTip('Search by node name')
 
         lyt_refresh = QHBoxLayout()
         lyt_refresh.addWidget(self._btn_refresh)
         lyt_refresh.addWidget(self._btn_expand)
+        lyt_refresh.addWidget(self._btn_profile)
+        lyt_refresh.addWidget(self._btn_export)
 
         lyt_search = QHBoxLayout()
         lbl_search = QLabel('Name Search')
         lyt_search.addWidget(lbl_search)
         lyt_search.addWidget(self._ledit_search)
+        lyt_search.addWidget(self._btn_upstream)
+        lyt_search.addWidget(self._btn_downstream)
 
         lyt_main = QVBoxLayout()
         lyt_main.addLayout(lyt_refresh)
@@ -134,7 +412,12 @@ class NodeLister(QFrame):
 
 
 class NodeTree(QTreeView):
-    def __init__(self):
+    def __init__(self, extra_columns=()):
+        """
+
+        :param extra_columns: columns shown after Node and Disable
+        :type extra_columns: list[ExtraColumn]
+        """
         super(NodeTree, self).__init__()
 
         self._model = NodeModel(self)
@@ -144,13 +427,119 @@ class NodeTree(QTreeView):
 
         self.setModel(self._proxy)
         self.setItemDelegate(NodeDelegate())
-        self.header().setResizeMode(self.header().ResizeToContents)
+        self.header().setResizeMode(QHeaderView.ResizeToContents)
+        self.add_extra_columns(extra_columns)
         self.header().setStretchLastSection(False)
+        self.header().setContextMenuPolicy(Qt.CustomContextMenu)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.setSortingEnabled(True)
         self.sortByColumn(self.model().sourceModel().HEADER.index('Node'), Qt.AscendingOrder)
 
+        self.header().customContextMenuRequested.connect(self._header_menu)
+        self.header().sortIndicatorChanged.connect(self._sort_changed)
+
+    def add_extra_columns(self, extra_columns):
+        """
+
+        :param extra_columns: columns added after the last column
+        :type extra_columns: list[ExtraColumn]
+        """
+        self._model.add_extra_columns(extra_columns)
+        for extra_column in extra_columns:
+            column = self._model.HEADER.index(extra_column.header)
+            self.header().setResizeMode(column, QHeaderView.Interactive)    # lazy values would keep resizing it
+            self.setColumnWidth(column, 120)
+
+    def expand_indexes(self, indexes):
+        """
+        Expands the indexes with the columns sized to their contents resized once, not after every index.
+
+        :param indexes:
+        :type indexes: list[QModelIndex]
+        """
+        for column in range(len(NodeModel.HEADER)):
+            self.header().setResizeMode(column, QHeaderView.Interactive)
+        try:
+            for index in indexes:
+                self.expand(index)
+        finally:
+            for column in range(len(NodeModel.HEADER)):
+                self.header().setResizeMode(column, QHeaderView.ResizeToContents)
+
+    def sort_by_extra_column(self, column, order):
+        """
+        The proxy can only sort an extra column by the values that were fetched,
+        so all of them are fetched before sorting.  Sorts even if the column and order did not change,
+        which the sort indicator ignores.
+
+        :param column:
+        :type column: int
+        :param order:
+        :type order: Qt.SortOrder
+        """
+        header = self._model.HEADER[column]
+
+        self.header().blockSignals(True)                # the proxy is sorted below, once the values are fetched
+        self.header().setSortIndicator(column, order)
+        self.header().blockSignals(False)
+
+        node_rows = []
+        for class_row in self._model.get_rows():
+            node_rows.extend(class_row.get_node_rows())
+
+        progress = QProgressDialog('Fetching %s' % header, 'Cancel', 0, len(node_rows), self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(500)
+
+        for i, node_row in enumerate(node_rows):
+            if i % 100 == 0:
+                progress.setValue(i)
+                if progress.wasCanceled():
+                    break
+            self._model.fetch_value(node_row, header)
+
+        progress.setValue(len(node_rows))
+
+        if self._proxy.sortColumn() == column and self._proxy.sortOrder() == order:
+            self._proxy.invalidate()                    # sort() does nothing when the column and order did not change
+        else:
+            self._proxy.sort(column, order)
+        self.viewport().update()
+
+    def _header_menu(self, pos):
+        """
+        Lists the extra columns so they can be hidden, hidden columns do not fetch values.
+
+        :param pos:
+        :type pos: QPoint
+        """
+        menu = QMenu(self)
+        for header in self._model.get_extra_headers():
+            column = self._model.HEADER.index(header)
+            action = QAction(header, menu)
+            action.setCheckable(True)
+            action.setChecked(not self.isColumnHidden(column))
+            action.toggled.connect(lambda checked, c=column: self.setColumnHidden(c, not checked))
+            menu.addAction(action)
+        if not menu.isEmpty():
+            menu.exec_(self.header().mapToGlobal(pos))
+
+    def _sort_changed(self, column, order):
+        """
+
+        :param column:
+        :type column: int
+        :param order:
+        :type order: Qt.SortOrder
+        """
+        if self._model.HEADER[column] in self._model.get_extra_headers():
+            self.sort_by_extra_column(column, order)
+
 
 class NodeDelegate(QStyledItemDelegate):
+    TEXT_MARGIN = 6                     # the horizontal margins QStyledItemDelegate adds around the text
+
     def editorEvent(self, event, model, option, index):
         """
 
@@ -165,13 +554,13 @@ class NodeDelegate(QStyledItemDelegate):
         :return:
         :rtype: bool
         """
+        if event.type() != QMouseEvent.MouseButtonRelease or index.column() >= len(NodeModel.HEADER):
+            return False
+
         idx = index.model().mapToSource(index)
         item = model.sourceModel().itemFromIndex(idx)
         row = item.get_parent_row()
 
-        if event.type() != QMouseEvent.MouseButtonRelease:
-            return False
-
         if type(row) == ClassRow:
             if event.button() == Qt.MouseButton.LeftButton:
                 if item.get_header() == 'Disable':
@@ -238,9 +627,13 @@ class NodeDelegate(QStyledItemDelegate):
         :rtype: QSize
         """
         idx = index.model().mapToSource(index)
+        model = idx.model()
+        row = model.get_row(idx)
+        if idx.column() >= len(NodeModel.HEADER):            # plain text, measured without the style
+            text = model.data(idx, NodeModel.DISPLAY_ROLE) or ''
+            return QSize(option.fontMetrics.boundingRect(text).width() + self.TEXT_MARGIN, row.ROW_HEIGHT)
+
         size = QStyledItemDelegate.sizeHint(self, option, idx)
-        item = idx.model().itemFromIndex(idx)
-        row = item.get_parent_row()
         size.setHeight(row.ROW_HEIGHT)
 
         return size
@@ -250,7 +643,14 @@ class NodeModel(QStandardItemModel):
     HEADER = [
         'Node',
         'Disable'
-    ]
+    ]                                   # the columns with items, the extra columns are served by data()
+
+    FETCH_SLICE = 0.01                  # seconds spent fetching extra column values before returning to the event loop
+
+    BACKGROUND_ROLE = Qt.BackgroundRole     # data() is called for every cell and role, looking up Qt each time is slow
+    DISPLAY_ROLE = Qt.DisplayRole
+    SORT_ROLE = Qt.UserRole
+    DATA_ROLES = (BACKGROUND_ROLE, DISPLAY_ROLE, SORT_ROLE)
 
     def __init__(self, tree_view):
         """
@@ -260,15 +660,53 @@ class NodeModel(QStandardItemModel):
         """
         super(NodeModel, self).__init__()
 
+        self._extra_columns = OrderedDict()
+        """:type: dict[str, ExtraColumn]"""
+        self.HEADER = list(NodeModel.HEADER)
+
         self.setHorizontalHeaderLabels(self.HEADER)
 
         self._tree_view = tree_view
 
         self._node_dict = {}
+        self._node_rows = {}
+        """:type: dict[str, NodeRow]"""            # {node name: NodeRow}
+
+        self._values = {}
+        """:type: dict[str, dict[str, tuple]]"""     # {node name: {header: (display value, sort value)}}
+        self._pending = OrderedDict()                   # {(node name, header): NodeRow}
+
+        self._fetch_timer = QTimer(self)
+        self._fetch_timer.setInterval(0)
+        self._fetch_timer.timeout.connect(self._fetch_pending)
+
+        self._upstream_timer = QTimer(self)            # once for many changed nodes, like disabling a class
+        self._upstream_timer.setSingleShot(True)
+        self._upstream_timer.setInterval(0)
+        self._upstream_timer.timeout.connect(self._invalidate_upstream)
+
+    def add_extra_columns(self, extra_columns):
+        """
+        Adds columns after the last column.  Their cells have no items, data() returns the fetched values.
+
+        :param extra_columns:
+        :type extra_columns: list[ExtraColumn]
+        """
+        for extra_column in extra_columns:
+            self._extra_columns[extra_column.header] = extra_column
+            self.HEADER.append(extra_column.header)
+
+        self.setHorizontalHeaderLabels(self.HEADER)
+        for class_row in self.get_rows():
+            class_row.first_item().setColumnCount(len(self.HEADER))
 
     def clear_rows(self):
         count = self.rowCount()
         self.removeRows(0, count)
+        self._node_rows.clear()
+        self._values.clear()
+        self._pending.clear()
+        self._fetch_timer.stop()
 
     def data(self, index, role=Qt.DisplayRole):
         """
@@ -280,20 +718,88 @@ class NodeModel(QStandardItemModel):
         :return:
         :rtype: QBrush
         """
-        item = self.itemFromIndex(index)
+        if role not in self.DATA_ROLES:
+            return QStandardItemModel.data(self, index, role)
+
+        extra = index.column() >= len(NodeModel.HEADER)
+        if not extra and role != self.BACKGROUND_ROLE:
+            return QStandardItemModel.data(self, index, role)
+
+        row = self.get_row(index)
+
+        if role != self.BACKGROUND_ROLE:
+            header = self.HEADER[index.column()]
+            if type(row) == NodeRow:
+                return self._extra_value(row, header, role)
+            elif self._extra_columns[header].has_class_value():
+                return self._extra_columns[header].class_value(row.get_item('Node').text())[
+                    0 if role == self.DISPLAY_ROLE else 1]
+            return None
+
         idx = self._tree_view.model().mapFromSource(index)
-        row = item.get_parent_row()
 
-        if role == Qt.BackgroundRole:
-            color = row.bg_color()
+        color = row.bg_color()
+
+        if idx.row() % 2 == 0:
+            color = color.darker(120)
+        if not extra and not self.itemFromIndex(index).isEnabled():
+            color = color.darker(110)
+        return QBrush(color)
+
+    def fetch_value(self, node_row, header):
+        """
+        Fetches the value of an extra column right away unless it is already cached.
+
+        :param node_row:
+        :type node_row: NodeRow
+        :param header:
+        :type header: str
+        :return: (display value, sort value)
+        :rtype: tuple
+        """
+        name = node_row.get_item('Node').text()
+        values = self._values.setdefault(name, {})
+        if header not in values:
+            values[header] = self._extra_columns[header].value(node_row.get_node())
+            self._pending.pop((name, header), None)
+        return values[header]
+
+    def flags(self, index):
+        """
+
+        :param index:
+        :type index: QModelIndex
+        :return: the flags of the Node item of the row for the extra columns, which have no items
+        :rtype: Qt.ItemFlags
+        """
+        if index.column() >= len(NodeModel.HEADER):
+            index = index.sibling(index.row(), 0)
+        return QStandardItemModel.flags(self, index)
+
+    def get_extra_headers(self):
+        return list(self._extra_columns.keys())
+
+    def get_node_row(self, node_name):
+        """
+
+        :param node_name:
+        :type node_name: str
+        :return: the NodeRow of the node, None if it is not listed
+        :rtype: NodeRow
+        """
+        return self._node_rows.get(node_name)
 
-            if idx.row() % 2 == 0:
-                color = color.darker(120)
-            if not item.isEnabled():
-                color = color.darker(110)
-            return QBrush(color)
+    def get_row(self, index):
+        """
 
-        return QStandardItemModel.data(self, index, role)
+        :param index: index of any column of the row
+        :type index: QModelIndex
+        :return:
+        :rtype: ClassRow|NodeRow
+        """
+        if index.column():
+            index = index.sibling(index.row(), 0)       # itemFromIndex would create items for the extra columns
+        return self.itemFromIndex(index).get_parent_row()
 
     def get_rows(self):
         """
@@ -348,7 +854,7 @@ class NodeModel(QStandardItemModel):
 
         self._node_dict = node_dict
 
-        class_list = node_dict.keys()
+        class_list = list(node_dict.keys())
         correct_sort(class_list)
         for i, node_class in enumerate(class_list):                                 # enumerate so order can be stored
             class_row = ClassRow(node_class, self, node_dict[node_class][0], i)
@@ -358,8 +864,101 @@ class NodeModel(QStandardItemModel):
             for j, node in enumerate(node_list):
                 node_row = NodeRow(class_row, self, node, j)
                 class_row.append_row(node_row)
+                self._node_rows[node_row.get_item('Node').text()] = node_row
+            class_row.first_item().setColumnCount(len(self.HEADER))
         self._tree_view.sortByColumn(self.HEADER.index('Node'), Qt.AscendingOrder)
 
+    def invalidate(self, node_name):
+        """
+        Forgets the extra column values of a node so they are fetched again.
+        The values of the columns that depend on upstream nodes are forgotten for every node once the event loop
+        runs again, the node may be upstream of any of them and many nodes often change at once.
+
+        :param node_name:
+        :type node_name: str
+        :return: True if there were values of the node to forget
+        :rtype: bool
+        """
+        if any(column.upstream for column in self._extra_columns.values()):
+            self._upstream_timer.start()
+        return self._values.pop(node_name, None) is not None
+
+    def invalidate_columns(self, headers):
+        """
+        Forgets the values of extra columns for all nodes so they are fetched again.
+
+        :param headers:
+        :type headers: list[str]
+        """
+        for values in self._values.values():
+            for header in headers:
+                values.pop(header, None)
+        self._tree_view.viewport().update()
+
+    def update_names(self):
+        """
+        Renames the NodeRows of the renamed nodes and moves their cached values to their new names.
+        """
+        for old_name, node_row in list(self._node_rows.items()):
+            try:
+                name = node_row.get_node().name()
+            except ValueError:                                  # the node was deleted
+                continue
+            if name == old_name:
+                continue
+
+            del self._node_rows[old_name]
+            self._node_rows[name] = node_row
+            node_row.get_item('Node').setText(name)
+            if old_name in self._values:
+                self._values[name] = self._values.pop(old_name)
+            for key in [key for key in self._pending if key[0] == old_name]:
+                self._pending[(name, key[1])] = self._pending.pop(key)
+
+    def _extra_value(self, row, header, role):
+        """
+        Returns the cached value, or queues it to be fetched and returns None until it is.
+
+        :param row:
+        :type row: NodeRow
+        :param header:
+        :type header: str
+        :param role:
+        :type role: int
+        :return:
+        :rtype: str|int|float|None
+        """
+        name = row.get_item('Node').text()
+        values = self._values.get(name)
+        if values is not None and header in values:
+            return values[header][0 if role == self.DISPLAY_ROLE else 1]
+
+        if role == self.DISPLAY_ROLE:                   # sorting asks for Qt.UserRole of every row, painting does not
+            key = (name, header)
+            if key not in self._pending:
+                self._pending[key] = row
+                if not self._fetch_timer.isActive():
+                    self._fetch_timer.start()
+        return None
+
+    def _fetch_pending(self):
+        """
+        Fetches queued extra column values for at most FETCH_SLICE seconds, the timer calls it again for the rest.
+        The view is repainted once per slice, emitting dataChanged for each value would resize the columns each time.
+        """
+        deadline = time.time() + self.FETCH_SLICE
+        while self._pending and time.time() < deadline:
+            (name, header), row = self._pending.popitem(last=False)
+            self.fetch_value(row, header)
+
+        self._tree_view.viewport().update()
+
+        if not self._pending:
+            self._fetch_timer.stop()
+
+    def _invalidate_upstream(self):
+        self.invalidate_columns([header for header, column in self._extra_columns.items() if column.upstream])
+
 
 class ClassRow(QObject):
     ROW_HEIGHT = 25
@@ -420,7 +1019,7 @@ class ClassRow(QObject):
         :rtype: str
         """
         if item in self._items.values():
-            for header in self._model.HEADER:
+            for header in NodeModel.HEADER:
                 if self._items[header] == item:
                     return header
         return None
@@ -445,7 +1044,7 @@ class ClassRow(QObject):
         :rtype: list[NodeItem]
         """
         items = list()
-        for header in self._model.HEADER:
+        for header in NodeModel.HEADER:
             items.append(self._items[header])
         return items
 
@@ -455,7 +1054,7 @@ class ClassRow(QObject):
         :param order:
         :type order: int
         """
-        for header in self._model.HEADER:
+        for header in NodeModel.HEADER:
             item = NodeItem(self)
             item.setSelectable(False)
             item.setEditable(False)
@@ -519,7 +1118,7 @@ class NodeRow(QObject):
         :rtype: str
         """
         if item in self._items.values():
-            for header in self._model.HEADER:
+            for header in NodeModel.HEADER:
                 if self._items[header] == item:
                     return header
         return None
@@ -547,7 +1146,7 @@ class NodeRow(QObject):
         :rtype: list[NodeItem]
         """
         items = list()
-        for header in self._model.HEADER:
+        for header in NodeModel.HEADER:
             items.append(self._items[header])
         return items
 
@@ -557,9 +1156,8 @@ class NodeRow(QObject):
         :param order:
         :type order: int
         """
-        for header in self._model.HEADER:
+        for header in NodeModel.HEADER:
             item = NodeItem(self)
-            item.setSelectable(False)
 
             if header == 'Node':
                 item.setText(self._node.name())
@@ -581,6 +1179,265 @@ class NodeRow(QObject):
             self._items[header] = item
 
 
+class ExtraColumn(object):
+    def __init__(self, header, fetch, class_fetch=None, upstream=False):
+        """
+
+        :param header: column header
+        :type header: str
+        :param fetch: function of a node returning (display value, sort value)
+        :type fetch: function
+        :param class_fetch: function of a node class returning (display value, sort value) for the ClassRow
+        :type class_fetch: function
+        :param upstream: if the value also depends on the nodes upstream, like the frame range of a Grade
+        :type upstream: bool
+        """
+        super(ExtraColumn, self).__init__()
+
+        self.header = header
+        self.upstream = upstream
+        self._fetch = fetch
+        self._class_fetch = class_fetch
+
+    def class_value(self, node_class):
+        """
+
+        :param node_class:
+        :type node_class: str
+        :return: (display value, sort value)
+        :rtype: tuple
+        """
+        return self._class_fetch(node_class)
+
+    def has_class_value(self):
+        return self._class_fetch is not None
+
+    def value(self, node):
+        """
+
+        :param node:
+        :type node: nuke.Node
+        :return: (display value, sort value), empty if the node does not have the value
+        :rtype: tuple
+        """
+        try:
+            return self._fetch(node)
+        except (AttributeError, NameError, RuntimeError, TypeError, ValueError):
+            return '', ''
+
+
+def _read_file(node):
+    if node.Class() != 'Read':
+        return '', ''
+    path = node.knob('file').value()
+    return path, path
+
+
+def _frame_range(node):
+    first = node.firstFrame()
+    return '%d-%d' % (first, node.lastFrame()), first
+
+
+def _error(node):
+    error = node.hasError()
+    return 'Error' if error else '', int(error)
+
+
+def _channels(node):
+    channels = node.channels()
+    layers = sorted(set(channel.split('.')[0] for channel in channels))
+    return ', '.join(layers), len(channels)
+
+
+def _write_output(node):
+    if node.Class() != 'Write':
+        return '', ''
+    path = nuke.filename(node) or ''
+    return path, path
+
+
+EXTRA_COLUMNS = [
+    ExtraColumn('Read File', _read_file),
+    ExtraColumn('Frame Range', _frame_range, upstream=True),
+    ExtraColumn('Error', _error, upstream=True),
+    ExtraColumn('Channels', _channels, upstream=True),
+    ExtraColumn('Write Output', _write_output)
+]
+
+
+class PerformanceProfile(object):
+    CATEGORIES = ('PROFILE_STORE', 'PROFILE_VALIDATE', 'PROFILE_REQUEST', 'PROFILE_ENGINE')
+    SORT_HEADER = 'Wall (ms)'
+    MEMORY_SIZE = re.compile(r'([\d.]+)\s*([KMGT]?)i?B(?:ytes)?\b', re.IGNORECASE)     # '12.5 MB' in memory info
+    MEMORY_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+    def __init__(self):
+        super(PerformanceProfile, self).__init__()
+
+        self._frames = ''
+        self._results = {}
+        """:type: dict[str, dict]"""                # {node full name: {'class', 'cpu', 'wall', 'ops', 'memory'}}
+        self._class_totals = {}
+        """:type: dict[str, dict]"""                # {node class: {'cpu', 'wall', 'ops', 'nodes'}}
+        self._total_wall = 0.0
+
+    def columns(self):
+        """
+
+        :return: the columns showing the cost of each node and the total of each class
+        :rtype: list[ExtraColumn]
+        """
+        return [
+            ExtraColumn(self.SORT_HEADER,
+                        lambda n: self._node_value(n, 'wall'), lambda c: self._class_value(c, 'wall')),
+            ExtraColumn('CPU (ms)', lambda n: self._node_value(n, 'cpu'), lambda c: self._class_value(c, 'cpu')),
+            ExtraColumn('Ops', lambda n: self._node_value(n, 'ops'), lambda c: self._class_value(c, 'ops')),
+            ExtraColumn('Memory', self._node_memory)
+        ]
+
+    def has_results(self):
+        return bool(self._results)
+
+    def headers(self):
+        return [column.header for column in self.columns()]
+
+    def run(self, writes, frame_range):
+        """
+        Renders the Write nodes with the performance timers on and keeps the cost of every node.
+
+        :param writes:
+        :type writes: list[nuke.Node]
+        :param frame_range:
+        :type frame_range: nuke.FrameRange
+        """
+        self._frames = str(frame_range)
+
+        nuke.resetPerformanceTimers()
+        nuke.startPerformanceTimers()
+        try:
+            nuke.executeMultiple(writes, ((frame_range.first(), frame_range.last(), frame_range.increment()),))
+        except RuntimeError:                                        # cancelled, keep what was rendered
+            pass
+        finally:
+            self._collect()
+            nuke.stopPerformanceTimers()
+
+    def to_json(self, path):
+        """
+
+        :param path:
+        :type path: str
+        """
+        data = {
+            'script': nuke.root().name(),
+            'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'frames': self._frames,
+            'total_wall_ms': self._total_wall,
+            'nodes': self._results,
+            'classes': self._class_totals,
+            'top': self.top()
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=4, sort_keys=True)
+
+    def top(self, fraction=0.8):
+        """
+
+        :param fraction: part of the total wall time
+        :type fraction: float
+        :return: the fewest node names, most expensive first, that take that part of the total wall time
+        :rtype: list[str]
+        """
+        names = sorted(self._results, key=lambda x: self._results[x]['wall'], reverse=True)
+        top = []
+        wall = 0.0
+        for name in names:
+            if wall >= self._total_wall * fraction:
+                break
+            top.append(name)
+            wall += self._results[name]['wall']
+        return top
+
+    def _class_value(self, node_class, key):
+        totals = self._class_totals.get(node_class)
+        if totals is None:
+            return '', None
+        return self._display(key, totals[key]), totals[key]
+
+    def _collect(self):
+        self._results = {}
+        self._class_totals = {}
+        self._total_wall = 0.0
+
+        categories = [getattr(nuke, category) for category in self.CATEGORIES]
+        for node in nuke.allNodes(recurseGroups=True):
+            cpu = wall = ops = 0
+            for category in categories:
+                info = node.performanceInfo(category)
+                cpu += info['timeTakenCPU']
+                wall += info['timeTakenWall']
+                ops += info['callCount']
+            if not ops:
+                continue
+
+            result = {
+                'class': node.Class(),
+                'cpu': cpu / 1000.0,                                # timers are in microseconds
+                'wall': wall / 1000.0,
+                'ops': ops,
+                'memory': self._memory(node)
+            }
+            self._results[node.fullName()] = result
+            self._total_wall += result['wall']
+
+            totals = self._class_totals.setdefault(node.Class(), {'cpu': 0.0, 'wall': 0.0, 'ops': 0, 'nodes': 0})
+            for key in ('cpu', 'wall', 'ops'):
+                totals[key] += result[key]
+            totals['nodes'] += 1
+
+    def _display(self, key, value):
+        if key == 'ops':
+            return str(value)
+        if key == 'wall' and self._total_wall:
+            return '%.1f (%.1f%%)' % (value, 100.0 * value / self._total_wall)
+        return '%.1f' % value
+
+    @staticmethod
+    def _memory(node):
+        try:
+            return nuke.memory('info', node.fullName()).strip()
+        except (RuntimeError, AttributeError):
+            return ''
+
+    def _memory_bytes(self, memory):
+        """
+
+        :param memory: memory info of a node, such as '12.5 MB'
+        :type memory: str
+        :return: the first size in the memory info in bytes so the column sorts by size, None if there is none
+        :rtype: float
+        """
+        match = self.MEMORY_SIZE.search(memory)
+        if match is None:
+            return None
+        try:
+            return float(match.group(1)) * self.MEMORY_UNITS[match.group(2).upper()]
+        except ValueError:                                          # only dots
+            return None
+
+    def _node_memory(self, node):
+        result = self._results.get(node.fullName())
+        if result is None:
+            return '', None
+        return result['memory'], self._memory_bytes(result['memory'])
+
+    def _node_value(self, node, key):
+        result = self._results.get(node.fullName())
+        if result is None:
+            return '', None
+        return self._display(key, result[key]), result[key]
+
+
 class NodeItem(QStandardItem):
     def __init__(self, row):
         """
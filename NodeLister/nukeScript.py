@@ -0,0 +1,123 @@
+"""
+
+Reads the nodes of a nuke script as text, without opening it in NUKE.
+Used by the Node Index to keep an inventory of the nodes of many scripts.
+
+"""
+
+__author__ = 'John'
+
+import io
+import re
+
+
+NODE_START = re.compile(r'^(?:clone (\S+)(?: ([A-Za-z_][\w.]*))?|([A-Za-z_][\w.]*)) \{\s*$')
+CLONE_ID = re.compile(r'^\$?(?:node|C)?(\w+)')           # clone node7f00aa|Blur|4242 is later clone $C7f00aa
+KNOB_LINE = re.compile(r'^\s*(name|disable)\s+(.*?)\s*$')
+GROUP_CLASSES = ('Group',)                                  # their child nodes follow them, closed by end_group
+
+
+def parse_script(path):
+    """
+    Reads the nodes of a nuke script without opening it in NUKE.
+
+    :param path:
+    :type path: str
+    :return: [(node class, name, disabled, group path),...], disabled is None when it is driven by an expression
+    :rtype: list[tuple]
+    """
+    nodes = []
+    groups = []
+    clones = {}
+
+    depth = 0
+    in_quote = False
+    node_class = None
+    knobs = {}
+
+    with io.open(path, encoding='utf-8', errors='replace') as f:         # labels may be in any encoding
+        for line in f:
+            if depth == 0 and not in_quote:
+                stripped = line.strip()
+                if stripped == 'end_group':
+                    if groups:
+                        groups.pop()
+                    continue
+
+                match = NODE_START.match(stripped)
+                if match:
+                    clone, clone_class, node_class = match.groups()
+                    if clone:
+                        parts = clone.split('|')
+                        clone_id = CLONE_ID.match(parts[0]).group(1)
+                        if clone_class or len(parts) > 1:
+                            clones[clone_id] = clone_class or parts[1]
+                        node_class = clones.get(clone_id, 'Clone')
+                    knobs = {}
+                    depth = 1
+                continue
+
+            if depth == 1 and not in_quote:
+                match = KNOB_LINE.match(line)
+                if match:
+                    knobs[match.group(1)] = match.group(2).strip('"')
+
+            depth, in_quote = _scan_braces(line, depth, in_quote)
+
+            if depth == 0:
+                if node_class != 'Root':
+                    name = knobs.get('name', node_class)
+                    disabled = _disabled(knobs.get('disable', 'false'))
+                    nodes.append((node_class, name, disabled, '.'.join(groups)))
+                    if node_class in GROUP_CLASSES:
+                        groups.append(name)
+                node_class = None
+
+    return nodes
+
+
+def _disabled(value):
+    """
+
+    :param value: value of the disable knob as written in the script
+    :type value: str
+    :return: 1 or 0, None if it is driven by an expression or animated
+    :rtype: int|None
+    """
+    if value.startswith('{'):
+        return None
+    return int(value not in ('false', '0'))
+
+
+def _scan_braces(line, depth, in_quote):
+    """
+    Follows the TCL quoting of a node body.  Quotes are only special for the knob values of the body itself,
+    inside braces they are literal, and braces are literal inside quotes.
+
+    :param line:
+    :type line: str
+    :param depth: brace depth at the start of the line
+    :type depth: int
+    :param in_quote: if the line starts inside a quoted value
+    :type in_quote: bool
+    :return: (brace depth, in quote) at the end of the line
+    :rtype: tuple
+    """
+    escaped = False
+    for char in line:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif in_quote:
+            if char == '"':
+                in_quote = False
+        elif char == '"' and depth == 1:
+            in_quote = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                break
+    return depth, in_quote
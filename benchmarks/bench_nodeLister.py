@@ -0,0 +1,358 @@
+"""
+
+Benchmarks NodeLister with synthetic scripts of 1k, 10k and 100k nodes.
+
+The nuke module is replaced by benchmarks/fake_nuke/nuke.py and Qt runs on the offscreen platform,
+so it runs headless on Linux.  With PySide (Qt 4), which has no offscreen platform, run it under xvfb-run.
+Every script size runs in its own process so the peak memory of one size does not hide the next.
+
+    python benchmarks/bench_nodeLister.py
+    python benchmarks/bench_nodeLister.py --sizes 1000 10000 --output before.json
+    python benchmarks/bench_nodeLister.py --compare before.json after.json
+
+Every scenario starts from the same state, unfiltered, collapsed and with nothing selected, and the
+DAG selection timer is stopped, so reports of different revisions are comparable.
+Times are in milliseconds, peak memory is the maximum resident set size in KB.  Scenarios that need parts of
+NodeLister the measured revision does not have, such as the dependency graph, are reported as skipped.
+
+"""
+
+from __future__ import division, print_function
+
+__author__ = 'John'
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import warnings
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+SIZES = [1000, 10000, 100000]
+SEARCH = 'Grade12'                                          # typed one keystroke at a time
+SCROLL_PAGES = 20
+SELECTION_SIZE = 5000
+SKIPPED = {'skipped': True}                                 # a scenario the measured NodeLister cannot run
+
+clock = getattr(time, 'perf_counter', time.time)
+
+
+def run_size(size, repeat):
+    """
+    Runs every scenario for one script size in this process.
+
+    :param size: number of nodes
+    :type size: int
+    :param repeat: number of times each scenario is timed
+    :type repeat: int
+    :return: {'scenarios': {scenario: {'min', 'median', 'max'} or SKIPPED}, 'peak_rss_kb': int, 'binding': str,
+             'qt': str}
+    :rtype: dict
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    warnings.simplefilter('ignore', DeprecationWarning)          # the Qt 4 signatures used by NodeLister
+    sys.path.insert(0, os.path.join(REPO_DIR, 'NodeLister'))
+    sys.path.insert(0, os.path.join(BENCH_DIR, 'fake_nuke'))
+    sys.path.insert(0, BENCH_DIR)
+
+    import qt_compat
+    binding, qt_version = qt_compat.install()
+
+    from PySide.QtCore import QEvent, QPoint, Qt
+    from PySide.QtGui import QApplication, QMouseEvent, QStyleOptionViewItem
+
+    import nuke
+    import nodeLister
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    nodes = nuke.build_script(size)
+
+    lister = nodeLister.NodeLister()
+    lister.resize(1000, 800)
+    lister.show()
+    app.processEvents()
+
+    poll_timer = getattr(lister, '_dag_selection_timer', None)
+    if poll_timer is not None:
+        poll_timer.stop()                                   # would fire inside the timed processEvents calls
+
+    tree = lister._tree
+    proxy = tree.model()
+    model = proxy.sourceModel()
+
+    scenarios = {}
+
+    def reset():
+        """
+        Every scenario starts unfiltered, collapsed, scrolled to the top, with nothing selected
+        and no extra column values left to fetch, whatever the previous scenario did.
+        """
+        lister._ledit_search.setText('')
+        tree.clearSelection()
+        nuke.select_in_dag([])
+        tree.collapseAll()
+        tree.verticalScrollBar().setValue(0)
+        app.processEvents()
+        while getattr(model, '_pending', None):
+            app.processEvents()
+
+    def refresh():
+        lister._refresh()
+        app.processEvents()
+
+    def search():
+        for i in range(1, len(SEARCH) + 1):
+            start = clock()
+            lister._ledit_search.setText(SEARCH[:i])
+            app.processEvents()
+            yield clock() - start
+        start = clock()
+        lister._ledit_search.setText('')
+        app.processEvents()
+        yield clock() - start
+
+    def expand():
+        tree.expandAll()
+        app.processEvents()
+
+    def collapse():
+        tree.collapseAll()
+        app.processEvents()
+
+    def scroll():
+        tree.expandAll()
+        app.processEvents()
+        scroll_bar = tree.verticalScrollBar()
+        for page in range(SCROLL_PAGES):
+            start = clock()
+            scroll_bar.setValue(min(scroll_bar.maximum(), page * scroll_bar.pageStep()))
+            tree.viewport().repaint()
+            yield clock() - start
+
+    def fetch_visible():
+        tree.expandAll()
+        tree.verticalScrollBar().setValue(0)
+        tree.viewport().repaint()
+        while model._pending:
+            app.processEvents()
+
+    def bulk_disable():
+        delegate = tree.itemDelegate()
+        option = QStyleOptionViewItem()
+        event = QMouseEvent(QEvent.MouseButtonRelease, QPoint(0, 0), Qt.LeftButton, Qt.LeftButton, Qt.NoModifier)
+        for class_row in model.get_rows():
+            index = proxy.mapFromSource(model.indexFromItem(class_row.get_item('Disable')))
+            delegate.editorEvent(event, proxy, option, index)
+        app.processEvents()
+
+    def select_in_dag():
+        nuke.select_in_dag(nodes[:SELECTION_SIZE])
+        lister.sync_dag_selection()
+        app.processEvents()
+        nuke.select_in_dag([])
+        lister.sync_dag_selection()
+        app.processEvents()
+
+    def graph():
+        lister._graph.invalidate()
+        lister._graph.upstream([nodes[-1].name()])
+
+    scenarios['refresh'] = _time(refresh, repeat, reset)
+    scenarios['search_keystroke'] = _time_steps(search, repeat, reset)
+    scenarios['expand_all'] = _time(expand, repeat, reset)
+    scenarios['collapse_all'] = _time(collapse, repeat, lambda: (reset(), expand()))
+    scenarios['scroll_repaint'] = _time_steps(scroll, repeat, reset)
+    # the scenarios below need parts of NodeLister that older or refactored versions may not have
+    scenarios['fetch_visible_columns'] = _time(fetch_visible, 1, reset) if hasattr(model, '_pending') else SKIPPED
+    scenarios['bulk_disable'] = _time(bulk_disable, repeat, reset)
+    scenarios['dag_selection_sync'] = (_time(select_in_dag, repeat, reset) if hasattr(lister, 'sync_dag_selection')
+                                       else SKIPPED)
+    scenarios['graph_build_upstream'] = _time(graph, repeat, reset) if hasattr(lister, '_graph') else SKIPPED
+
+    lister.close()
+
+    return {
+        'scenarios': scenarios,
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'binding': binding,
+        'qt': qt_version
+    }
+
+
+def _stats(seconds):
+    """
+
+    :param seconds:
+    :type seconds: list[float]
+    :return: {'min', 'median', 'max'} in milliseconds
+    :rtype: dict
+    """
+    seconds = sorted(seconds)
+    return {
+        'min': seconds[0] * 1000,
+        'median': seconds[len(seconds) // 2] * 1000,
+        'max': seconds[-1] * 1000
+    }
+
+
+def _time(func, repeat, setup):
+    """
+
+    :param func: the scenario
+    :type func: function
+    :param repeat:
+    :type repeat: int
+    :param setup: called before each run, not timed
+    :type setup: function
+    :return: {'min', 'median', 'max'} in milliseconds
+    :rtype: dict
+    """
+    seconds = []
+    for _ in range(repeat):
+        setup()
+        start = clock()
+        func()
+        seconds.append(clock() - start)
+    return _stats(seconds)
+
+
+def _time_steps(func, repeat, setup):
+    """
+    Times every step of a generator, such as every keystroke of a search, instead of the whole scenario.
+    """
+    seconds = []
+    for _ in range(repeat):
+        setup()
+        seconds.extend(func())
+    return _stats(seconds)
+
+
+def benchmark(sizes, repeat):
+    """
+    Runs every size in a child process.
+
+    :param sizes:
+    :type sizes: list[int]
+    :param repeat:
+    :type repeat: int
+    :return: the report
+    :rtype: dict
+    """
+    report = {
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'revision': _revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'sizes': {}
+    }
+
+    for size in sizes:
+        print('%d nodes...' % size, file=sys.stderr)
+        output = subprocess.check_output([sys.executable, os.path.abspath(__file__),
+                                          '--child', str(size), '--repeat', str(repeat)])
+        result = json.loads(output.decode('utf-8').strip().splitlines()[-1])
+        report['binding'] = result.pop('binding')
+        report['qt'] = result.pop('qt')
+        report['sizes'][str(size)] = result
+
+    return report
+
+
+def compare(old_path, new_path):
+    """
+    Prints the median of every scenario of two reports and how much faster or slower the new one is.
+
+    :param old_path:
+    :type old_path: str
+    :param new_path:
+    :type new_path: str
+    """
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    print('%-8s %-24s %12s %12s %8s' % ('nodes', 'scenario', 'old (ms)', 'new (ms)', 'ratio'))
+    for size in sorted(set(old['sizes']) & set(new['sizes']), key=int):
+        old_size = old['sizes'][size]
+        new_size = new['sizes'][size]
+        for scenario in sorted(set(old_size['scenarios']) | set(new_size['scenarios'])):
+            old_stats = old_size['scenarios'].get(scenario, SKIPPED)
+            new_stats = new_size['scenarios'].get(scenario, SKIPPED)
+            if old_stats.get('skipped') or new_stats.get('skipped'):
+                print('%-8s %-24s %12s %12s' % (size, scenario, _median(old_stats), _median(new_stats)))
+                continue
+            old_ms = old_stats['median']
+            new_ms = new_stats['median']
+            ratio = new_ms / old_ms if old_ms else float('nan')
+            print('%-8s %-24s %12.2f %12.2f %7.2fx' % (size, scenario, old_ms, new_ms, ratio))
+        print('%-8s %-24s %12d %12d %7.2fx' % (size, 'peak_rss_kb', old_size['peak_rss_kb'], new_size['peak_rss_kb'],
+                                               new_size['peak_rss_kb'] / old_size['peak_rss_kb']))
+
+
+def print_report(report):
+    print('%s %s, %s, Python %s, revision %s' % (report['binding'], report['qt'], report['platform'],
+                                                report['python'], report['revision']))
+    print('%-8s %-24s %12s %12s %12s' % ('nodes', 'scenario', 'min (ms)', 'median (ms)', 'max (ms)'))
+    for size in sorted(report['sizes'], key=int):
+        result = report['sizes'][size]
+        for scenario in sorted(result['scenarios']):
+            stats = result['scenarios'][scenario]
+            if stats.get('skipped'):
+                print('%-8s %-24s %12s' % (size, scenario, 'skipped'))
+                continue
+            print('%-8s %-24s %12.2f %12.2f %12.2f' % (size, scenario, stats['min'], stats['median'], stats['max']))
+        print('%-8s %-24s %12d' % (size, 'peak_rss_kb', result['peak_rss_kb']))
+
+
+def _median(stats):
+    """
+
+    :param stats: {'min', 'median', 'max'} or SKIPPED
+    :type stats: dict
+    :return: the median in milliseconds for a report column
+    :rtype: str
+    """
+    if stats.get('skipped'):
+        return 'skipped'
+    return '%.2f' % stats['median']
+
+
+def _revision():
+    try:
+        output = subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR)
+        return output.decode('utf-8').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark NodeLister with synthetic scripts.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='numbers of nodes')
+    parser.add_argument('--repeat', type=int, default=3, help='times each scenario is timed')
+    parser.add_argument('--output', help='save the report as JSON')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two JSON reports')
+    parser.add_argument('--child', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+    elif args.child:
+        print(json.dumps(run_size(args.child, args.repeat)))
+    else:
+        report = benchmark(args.sizes, args.repeat)
+        print_report(report)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=4, sort_keys=True)
+
+if __name__ == '__main__':
+    main()
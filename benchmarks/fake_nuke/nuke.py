@@ -0,0 +1,321 @@
+"""
+Stands in for the nuke module so NodeLister can be benchmarked and tested outside of NUKE.
+
+Only what NodeLister, the benchmark and the tests call is provided.  build_script fills the script with
+synthetic nodes and select_in_dag selects nodes the way the Node Graph does.  Like NUKE with closed control
+panels, selecting nodes does not call the knobChanged callbacks.
+"""
+
+__author__ = 'John'
+
+import random
+
+INPUTS = 1
+HIDDEN_INPUTS = 2
+EXPRESSIONS = 4
+
+# (node class, number of inputs, has a disable knob, weight)
+CLASSES = [
+    ('Read', 0, True, 8),
+    ('Write', 1, True, 1),
+    ('Blur', 1, True, 10),
+    ('Grade', 1, True, 14),
+    ('ColorCorrect', 1, True, 6),
+    ('Merge2', 2, True, 12),
+    ('Transform', 1, True, 10),
+    ('Shuffle', 1, True, 6),
+    ('Dot', 1, False, 12),
+    ('BackdropNode', 0, False, 2)
+] + [('gizmo_%02d' % i, 1, True, 0.5) for i in range(40)]
+
+_nodes = []
+_root = None
+_callbacks = {'knobChanged': [], 'onCreate': [], 'onDestroy': []}
+_this = []                                                  # [(node, knob),...] of the running callbacks
+
+
+class Knob(object):
+    def __init__(self, name, value):
+        super(Knob, self).__init__()
+
+        self._name = name
+        self._value = value
+
+    def name(self):
+        return self._name
+
+    def setValue(self, value):
+        self._value = value
+        return True
+
+    def value(self):
+        return self._value
+
+
+class Node(object):
+    def __init__(self, node_class, name, inputs=(), knobs=None, pos=(0, 0), links=()):
+        """
+
+        :param node_class:
+        :type node_class: str
+        :param name:
+        :type name: str
+        :param inputs:
+        :type inputs: list[Node]
+        :param knobs: {knob name: value}
+        :type knobs: dict
+        :param pos: (xpos, ypos)
+        :type pos: tuple
+        :param links: nodes its knob expressions refer to
+        :type links: list[Node]
+        """
+        super(Node, self).__init__()
+
+        self._node_class = node_class
+        self._inputs = list(inputs)
+        self._links = list(links)
+        self._knobs = {'name': Knob('name', name), 'selected': Knob('selected', False),
+                       'xpos': Knob('xpos', pos[0]), 'ypos': Knob('ypos', pos[1])}
+        for knob_name, value in (knobs or {}).items():
+            self._knobs[knob_name] = Knob(knob_name, value)
+
+    def Class(self):
+        return self._node_class
+
+    def channels(self):
+        return ['rgba.red', 'rgba.green', 'rgba.blue', 'rgba.alpha']
+
+    def dependencies(self, what=INPUTS | HIDDEN_INPUTS | EXPRESSIONS):
+        nodes = []
+        if what & (INPUTS | HIDDEN_INPUTS):
+            nodes.extend(node for node in self._inputs if node is not None)
+        if what & EXPRESSIONS:
+            nodes.extend(self._links)
+        return nodes
+
+    def firstFrame(self):
+        return 1001
+
+    def fullName(self):
+        return self.name()
+
+    def hasError(self):
+        return False
+
+    def isSelected(self):
+        return self._knobs['selected'].value()
+
+    def knob(self, name):
+        return self._knobs.get(name)
+
+    def knobs(self):
+        return self._knobs
+
+    def lastFrame(self):
+        return 1100
+
+    def name(self):
+        return self._knobs['name'].value()
+
+    def performanceInfo(self, category=None):
+        return {'callCount': 0, 'timeTakenCPU': 0, 'timeTakenWall': 0}
+
+    def screenHeight(self):
+        return 18
+
+    def screenWidth(self):
+        return 80
+
+    def setInput(self, i, node):
+        while len(self._inputs) <= i:
+            self._inputs.append(None)
+        self._inputs[i] = node
+        return True
+
+    def setName(self, name, uncollide=True, updateExpressions=False):
+        self._knobs['name'].setValue(name)
+
+    def setSelected(self, selected):
+        self._knobs['selected'].setValue(bool(selected))
+
+    def xpos(self):
+        return self._knobs['xpos'].value()
+
+    def ypos(self):
+        return self._knobs['ypos'].value()
+
+
+class FrameRange(object):
+    def __init__(self, frames):
+        first, _, last = str(frames).partition('-')
+        self._first = int(first)
+        self._last = int(last or first)
+
+    def __str__(self):
+        return '%d-%d' % (self._first, self._last)
+
+    def first(self):
+        return self._first
+
+    def increment(self):
+        return 1
+
+    def last(self):
+        return self._last
+
+
+def build_script(count, seed=0):
+    """
+    Replaces the nodes of the script with count synthetic nodes.
+    Every node is connected to recently created nodes, like a comp grows down the DAG.
+
+    :param count:
+    :type count: int
+    :param seed:
+    :type seed: int
+    :return:
+    :rtype: list[Node]
+    """
+    global _root
+
+    rng = random.Random(seed)
+    weights = [node_class[3] for node_class in CLASSES]
+    total = float(sum(weights))
+
+    del _nodes[:]
+    _root = Node('Root', 'root', knobs={'first_frame': 1001, 'last_frame': 1100})
+    counters = {}
+
+    for i in range(count):
+        pick = rng.random() * total
+        for node_class, input_count, has_disable, weight in CLASSES:
+            pick -= weight
+            if pick <= 0:
+                break
+
+        counters[node_class] = counters.get(node_class, 0) + 1
+        recent = _nodes[-50:]
+        inputs = [rng.choice(recent) for _ in range(input_count)] if recent else []
+
+        knobs = {}
+        if has_disable:
+            knobs['disable'] = rng.random() < 0.1
+        if node_class in ('Read', 'Write'):
+            knobs['file'] = '/shots/sh%04d/comp/%s%d.####.exr' % (i % 500, node_class, counters[node_class])
+
+        _nodes.append(Node(node_class, '%s%d' % (node_class, counters[node_class]), inputs, knobs,
+                           ((i % 200) * 110, (i // 200) * 60)))
+    return list(_nodes)
+
+
+def select_in_dag(nodes):
+    """
+    Selects only the nodes.
+
+    :param nodes:
+    :type nodes: list[Node]
+    """
+    selected = set(id(node) for node in nodes)
+    for node in _nodes:
+        node.setSelected(id(node) in selected)
+
+
+def _run_callbacks(name, node, knob=None):
+    _this.append((node, knob))
+    try:
+        for func in list(_callbacks[name]):
+            func()
+    finally:
+        _this.pop()
+
+
+def addKnobChanged(func, args=(), kwargs=None, nodeClass='*'):
+    _callbacks['knobChanged'].append(func)
+
+
+def addOnCreate(func, args=(), kwargs=None, nodeClass='*'):
+    _callbacks['onCreate'].append(func)
+
+
+def addOnDestroy(func, args=(), kwargs=None, nodeClass='*'):
+    _callbacks['onDestroy'].append(func)
+
+
+def allNodes(filter=None, group=None, recurseGroups=False):
+    if filter is None:
+        return list(_nodes)
+    return [node for node in _nodes if node.Class() == filter]
+
+
+def createNode(node, args=None, inpanel=True):
+    """
+    Adds a node named after its class, calling the onCreate callbacks before it is connected like NUKE does.
+
+    :param node: node class
+    :type node: str
+    :return:
+    :rtype: Node
+    """
+    names = set(other.name() for other in _nodes)
+    i = 1
+    while '%s%d' % (node, i) in names:
+        i += 1
+    new_node = Node(node, '%s%d' % (node, i))
+    _nodes.append(new_node)
+    _run_callbacks('onCreate', new_node)
+    return new_node
+
+
+def delete(node):
+    _run_callbacks('onDestroy', node)
+    _nodes.remove(node)
+    for other in _nodes:
+        other._inputs = [None if input_node is node else input_node for input_node in other._inputs]
+        other._links = [link for link in other._links if link is not node]
+
+
+def filename(node, type=None):
+    knob = node.knob('file')
+    if knob is None:
+        return None
+    return knob.value()
+
+
+def getInput(message, default=''):
+    return default
+
+
+def message(text):
+    print(text)
+
+
+def removeKnobChanged(func, args=(), kwargs=None, nodeClass='*'):
+    _callbacks['knobChanged'].remove(func)
+
+
+def removeOnCreate(func, args=(), kwargs=None, nodeClass='*'):
+    _callbacks['onCreate'].remove(func)
+
+
+def removeOnDestroy(func, args=(), kwargs=None, nodeClass='*'):
+    _callbacks['onDestroy'].remove(func)
+
+
+def root():
+    return _root
+
+
+def selectedNodes(filter=None):
+    return [node for node in allNodes(filter) if node.isSelected()]
+
+
+def thisKnob():
+    return _this[-1][1]
+
+
+def thisNode():
+    return _this[-1][0]
+
+
+def zoom(scale, center=None):
+    pass
@@ -0,0 +1,65 @@
+"""
+NodeLister imports PySide, the Qt 4 binding of NUKE 10 and earlier.
+When only PySide2 or PySide6 is installed, install() makes them importable as PySide so the same code can be
+benchmarked.  QtGui gets the classes that moved to QtWidgets and QtCore, and QHeaderView gets setResizeMode and
+its resize modes on instances back.
+
+PySide6 is tested with 6.6 and 6.7 (benchmarks/requirements.txt pins 6.7.3).  Later releases such as 6.12 abort
+with none_dealloc in NodeDelegate.sizeHint, install() warns when another version is used.
+"""
+
+__author__ = 'John'
+
+import sys
+import types
+import warnings
+
+MOVED_TO_QTCORE = ('QItemSelection', 'QItemSelectionModel', 'QSortFilterProxyModel')
+TESTED_PYSIDE6 = ('6.6', '6.7')                 # major.minor versions of PySide6 the benchmarks run with
+
+
+def install():
+    """
+
+    :return: (binding name, Qt version)
+    :rtype: tuple
+    """
+    try:
+        from PySide import QtCore
+        return 'PySide', QtCore.qVersion()
+    except ImportError:
+        pass
+
+    try:
+        import PySide6 as binding
+        from PySide6 import QtCore, QtGui, QtWidgets
+        if '.'.join(binding.__version__.split('.')[:2]) not in TESTED_PYSIDE6:
+            warnings.warn('PySide6 %s is untested, 6.12 aborts in NodeDelegate.sizeHint, use PySide6-Essentials==6.7.3'
+                          % binding.__version__)
+    except ImportError:
+        import PySide2 as binding
+        from PySide2 import QtCore, QtGui, QtWidgets
+
+    qt_gui = types.ModuleType('PySide.QtGui')
+    for module in (QtGui, QtWidgets):
+        for name in dir(module):
+            if name.startswith('Q'):
+                setattr(qt_gui, name, getattr(module, name))
+    for name in MOVED_TO_QTCORE:
+        setattr(qt_gui, name, getattr(QtCore, name))
+
+    if not hasattr(QtWidgets.QHeaderView, 'setResizeMode'):
+        QtWidgets.QHeaderView.setResizeMode = QtWidgets.QHeaderView.setSectionResizeMode
+    if binding.__name__ == 'PySide6':
+        # the Python enums of PySide6 6.4 and later are only found on the class, PySide2 enums are not iterable
+        for name, mode in getattr(QtWidgets.QHeaderView.ResizeMode, '__members__', {}).items():
+            setattr(QtWidgets.QHeaderView, name, mode)
+
+    package = types.ModuleType('PySide')
+    package.QtCore = QtCore
+    package.QtGui = qt_gui
+    sys.modules['PySide'] = package
+    sys.modules['PySide.QtCore'] = QtCore
+    sys.modules['PySide.QtGui'] = qt_gui
+
+    return binding.__name__, QtCore.qVersion()
@@ -0,0 +1,78 @@
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, 'NodeLister'))
+sys.path.insert(0, os.path.join(REPO_DIR, 'benchmarks', 'fake_nuke'))
+
+import nuke
+from dependencyGraph import DependencyGraph
+
+
+def _script():
+    """
+    Read1 - Grade1 - Merge1 - Write1
+    Read2 ---------/
+    Grade2 has an expression linked to Grade1
+    """
+    nuke.build_script(0)
+    nodes = {}
+    for node_class in ('Read', 'Read', 'Grade', 'Grade', 'Merge', 'Write'):
+        node = nuke.createNode(node_class)
+        nodes[node.name()] = node
+    nodes['Grade1'].setInput(0, nodes['Read1'])
+    nodes['Merge1'].setInput(0, nodes['Grade1'])
+    nodes['Merge1'].setInput(1, nodes['Read2'])
+    nodes['Write1'].setInput(0, nodes['Merge1'])
+    nodes['Grade2']._links.append(nodes['Grade1'])
+    return nodes
+
+
+def test_walk():
+    _script()
+    graph = DependencyGraph()
+    assert graph.upstream(['Write1']) == {'Write1', 'Merge1', 'Grade1', 'Read1', 'Read2'}
+    assert graph.downstream(['Read2']) == {'Read2', 'Merge1', 'Write1'}
+    assert graph.downstream(['Grade1']) == {'Grade1', 'Grade2', 'Merge1', 'Write1'}        # expression link
+
+
+def test_rewire():
+    nodes = _script()
+    graph = DependencyGraph()
+    assert 'Read2' in graph.upstream(['Write1'])
+
+    nodes['Merge1'].setInput(1, None)
+    nodes['Write1'].setInput(1, nodes['Grade2'])
+    assert 'Read2' in graph.upstream(['Write1'])            # cached until invalidated
+    graph.invalidate()
+    assert graph.upstream(['Write1']) == {'Write1', 'Merge1', 'Grade1', 'Grade2', 'Read1'}
+
+
+def test_create_and_delete():
+    nodes = _script()
+    graph = DependencyGraph()
+    graph.downstream(['Read1'])
+    nuke.addOnCreate(graph.invalidate)
+    nuke.addOnDestroy(graph.invalidate)
+    try:
+        blur = nuke.createNode('Blur')
+        blur.setInput(0, nodes['Read1'])                    # connected after onCreate
+        assert 'Blur1' in graph.downstream(['Read1'])
+
+        nuke.delete(nodes['Merge1'])
+        assert graph.upstream(['Write1']) == {'Write1'}
+        assert 'Merge1' not in graph.downstream(['Read2'])
+    finally:
+        nuke.removeOnCreate(graph.invalidate)
+        nuke.removeOnDestroy(graph.invalidate)
+
+
+def test_rename():
+    nodes = _script()
+    graph = DependencyGraph()
+    graph.upstream(['Write1'])
+
+    nodes['Merge1'].setName('Comp')
+    graph.invalidate()
+    assert graph.upstream(['Write1']) == {'Write1', 'Comp', 'Grade1', 'Read1', 'Read2'}
+    assert graph.downstream(['Comp']) == {'Comp', 'Write1'}
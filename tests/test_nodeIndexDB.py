@@ -0,0 +1,99 @@
+import os
+import shutil
+import sqlite3
+import sys
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(TESTS_DIR), 'NodeLister'))
+
+from nodeIndexDB import NodeIndex
+
+
+def _write_script(path, *nodes):
+    """
+
+    :param path:
+    :type path: pathlib.Path
+    :param nodes: (node class, name)
+    :type nodes: tuple
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(u''.join(u'%s {\n name %s\n}\n' % node for node in nodes))
+
+
+def _names(index, **kwargs):
+    return sorted(node.full_name() for node in index.find(**kwargs))
+
+
+def test_update_only_scans_changed_scripts(tmp_path):
+    root = tmp_path / 'shots'
+    _write_script(root / 'a.nk', ('Read', 'Read1'), ('Blur', 'Blur1'))
+    _write_script(root / 'sh010' / 'b.nk', ('Blur', 'Blur2'))
+    (root / 'notes.txt').write_text(u'Blur {\n name Blur3\n}\n')
+
+    index = NodeIndex(str(tmp_path / 'index.db'))
+    assert index.update(str(root)) == (2, 0)
+    assert _names(index, node_class='Blur') == ['Blur1', 'Blur2']
+
+    assert index.update(str(root)) == (0, 0)
+
+    _write_script(root / 'a.nk', ('Read', 'Read1'), ('Blur', 'Blur1'), ('Grade', 'Grade1'))
+    assert index.update(str(root)) == (1, 0)
+    assert _names(index) == ['Blur1', 'Blur2', 'Grade1', 'Read1']
+
+
+def test_update_forgets_removed_scripts(tmp_path):
+    root = tmp_path / 'shots'
+    _write_script(root / 'a.nk', ('Blur', 'Blur1'))
+    _write_script(root / 'sh010' / 'b.nk', ('Blur', 'Blur2'))
+
+    index = NodeIndex(str(tmp_path / 'index.db'))
+    index.update(str(root))
+
+    os.remove(str(root / 'sh010' / 'b.nk'))
+    assert index.update(str(root)) == (0, 1)
+    assert _names(index) == ['Blur1']
+    assert index.scripts_using('Blur') == [str(root / 'a.nk')]
+
+
+def test_update_keeps_scripts_outside_root(tmp_path):
+    _write_script(tmp_path / 'shots' / 'a.nk', ('Blur', 'Blur1'))
+    _write_script(tmp_path / 'shots2' / 'b.nk', ('Blur', 'Blur2'))         # shares the prefix of shots
+    _write_script(tmp_path / 'shots' / 'sh010' / 'c.nk', ('Blur', 'Blur3'))
+
+    index = NodeIndex(str(tmp_path / 'index.db'))
+    index.update(str(tmp_path / 'shots'))
+    index.update(str(tmp_path / 'shots2'))
+
+    assert index.update(str(tmp_path / 'shots' / 'sh010')) == (0, 0)        # a.nk is not under sh010
+    assert index.update(str(tmp_path / 'shots')) == (0, 0)                  # b.nk is not under shots
+    assert _names(index) == ['Blur1', 'Blur2', 'Blur3']
+
+
+def test_older_database_is_rebuilt(tmp_path):
+    root = tmp_path / 'shots'
+    root.mkdir()
+    script = str(root / 'clones.nk')
+    shutil.copy(os.path.join(TESTS_DIR, 'scripts', 'clones.nk'), script)
+    stat = os.stat(script)
+
+    db_path = str(tmp_path / 'index.db')
+    conn = sqlite3.connect(db_path)                         # made before VERSION, disabled could not be NULL
+    conn.executescript("""
+        CREATE TABLE scripts (path TEXT PRIMARY KEY, mtime REAL NOT NULL, size INTEGER NOT NULL);
+        CREATE TABLE nodes (script TEXT NOT NULL, node_class TEXT NOT NULL, name TEXT NOT NULL,
+                            disabled INTEGER NOT NULL, group_path TEXT NOT NULL);
+    """)
+    conn.execute('INSERT INTO scripts VALUES (?, ?, ?)', (script, stat.st_mtime, stat.st_size))
+    conn.execute("INSERT INTO nodes VALUES (?, 'Clone', 'Blur2', 1, '')", (script,))
+    conn.commit()
+    conn.close()
+
+    index = NodeIndex(db_path)
+    assert index.update(str(root)) == (1, 0)                # unchanged on disk, parsed again
+    assert _names(index, node_class='Clone') == []
+    assert _names(index, node_class='Blur') == ['Blur1', 'Blur2']
+    assert [node.knob('disable').value() for node in index.find(node_class='Grade')] == [None]
+    index.close()
+
+    assert NodeIndex(db_path).update(str(root)) == (0, 0)
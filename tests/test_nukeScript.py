@@ -0,0 +1,27 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'NodeLister'))
+
+from nukeScript import parse_script
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts', 'clones.nk')
+
+
+def test_parse_script():
+    assert parse_script(SCRIPT) == [
+        ('Read', 'Read1', 0, ''),
+        ('Blur', 'Blur1', 0, ''),
+        ('Blur', 'Blur2', 1, ''),
+        ('Group', 'Group1', 0, ''),
+        ('Input', 'Input1', 0, 'Group1'),
+        ('Grade', 'Grade1', None, 'Group1'),
+        ('Output', 'Output1', 0, 'Group1'),
+        ('Write', 'Write1', 0, ''),
+    ]
+
+
+def test_parse_script_not_utf8(tmp_path):
+    path = tmp_path / 'latin1.nk'
+    path.write_bytes(u'Blur {\n name Blur1\n label "caf\xe9"\n}\n'.encode('latin-1'))
+    assert parse_script(str(path)) == [('Blur', 'Blur1', 0, '')]